@@ -1,7 +1,5 @@
 import argparse
 import os
-from load_data import CommentAnalyzer
-from visualiser import HateSpeechVisualizer
 import logging
 
 def setup_logging():
@@ -22,8 +20,12 @@ def main():
     
     parser.add_argument('--max-batches', type=int, default=50,
                        help='Maximum number of batches to process (default: 50)')
+    parser.add_argument('--batch-size', type=int, default=100,
+                       help='Number of comments per batch (default: 100)')
     parser.add_argument('--no-prefilter', action='store_true',
                        help='Disable profanity prefiltering before API calls')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Disable the on-disk cache of Gemini responses')
     parser.add_argument('--charts', action='store_true',
                        help='Generate visualization charts')
     parser.add_argument('--compare', type=str, metavar='FILE2',
@@ -37,6 +39,8 @@ def main():
     parser.add_argument('--api-key', type=str, help='Google API key (optional, can use environment variable)')
     
     args = parser.parse_args()
+    # HSV_FAST prints the requested listings and metrics without rendering any chart
+    plot = not os.environ.get('HSV_FAST')
     
     try:
         setup_logging()
@@ -51,6 +55,8 @@ def main():
             # Validate output file exists
             output_file = validate_file_path(args.output)
             
+            # Analysis dependencies are never imported on the charts-only path
+            from visualiser import HateSpeechVisualizer
             
             # Initialize visualizer with the output file
             visualizer = HateSpeechVisualizer(output_file)
@@ -61,21 +67,21 @@ def main():
 
             if args.compare:
                 compare_file = validate_file_path(args.compare)
-                visualizer = HateSpeechVisualizer(output_file, compare_file)
-                visualizer.compare_results()
+                visualizer.set_compare_file(compare_file)
+                visualizer.compare_results(plot=plot)
 
             # Handle filter-type and top-severe options
             if args.top_severe:
                 if args.filter_type:
                     logging.info(f"\nTop {args.top_severe} most severe comments for offense type: {args.filter_type}")
-                    visualizer.plot_top_offensive_comments(args.top_severe, args.filter_type)
+                    visualizer.plot_top_offensive_comments(args.top_severe, args.filter_type, plot=plot)
                 else:
                     logging.info(f"\nTop {args.top_severe} most severe comments:")
-                    visualizer.plot_top_offensive_comments(args.top_severe)
+                    visualizer.plot_top_offensive_comments(args.top_severe, plot=plot)
 
-            if args.filter_type and args.top_severe <= 0:
+            if args.filter_type and not args.top_severe:
                 logging.info(f"\nFiltered results for offense type : {args.filter_type} plotted")
-                visualizer.plot_offense_types(args.filter_type)
+                visualizer.plot_offense_types(args.filter_type, plot=plot)
             
             return 0
 
@@ -87,12 +93,17 @@ def main():
         if not api_key:
             raise ValueError("Google API key not provided. Set it via --api-key or GOOGLE_API_KEY environment variable")
 
+        from load_data import CommentAnalyzer
+        from visualiser import HateSpeechVisualizer
+
         # Initialize and run the analyzer
         analyzer = CommentAnalyzer(
             data_path=input_file,
             api_key=api_key,
             max_batches=args.max_batches,
-            use_prefilter=not args.no_prefilter
+            batch_size=args.batch_size,
+            use_prefilter=not args.no_prefilter,
+            use_cache=not args.no_cache
         )
 
         logging.info("Loading and analyzing data...")
@@ -111,23 +122,25 @@ def main():
 
             if args.compare:
                 compare_file = validate_file_path(args.compare)
-                visualizer = HateSpeechVisualizer(args.output, compare_file)
-                visualizer.compare_results()
+                visualizer.set_compare_file(compare_file)
+                visualizer.compare_results(plot=plot)
 
         # Handle filter-type and top-severe options
-        if args.top_severe!=10:
+        if args.top_severe:
             if args.filter_type:
                 logging.info(f"\nTop {args.top_severe} most severe comments for offense type: {args.filter_type}")
-                visualizer.plot_top_offensive_comments(args.top_severe, args.filter_type)
             else:
                 logging.info(f"\nTop {args.top_severe} most severe comments:")
-                visualizer.plot_top_offensive_comments(args.top_severe)
+            # Rank once in the analyzer and hand the same rows to the chart
+            top_comments = analyzer.display_top_severe_comments(args.top_severe, args.filter_type)
+            if top_comments is not None:
+                visualizer.plot_top_offensive_comments(args.top_severe, args.filter_type, precomputed=top_comments, plot=plot)
 
-        if args.filter_type and args.top_severe <= 0:
+        if args.filter_type and not args.top_severe:
             logging.info(f"\nFiltered results for offense type: {args.filter_type}")
             analyzer.filter_by_offense_type(args.filter_type)
             if args.charts:
-                visualizer.plot_offense_types(args.filter_type)
+                visualizer.plot_offense_types(args.filter_type, plot=plot)
             
     except Exception as e:
         logging.error(f"Error: {str(e)}")
@@ -1,15 +1,22 @@
 import pandas as pd
+import csv
+import functools
+import io
 import os
 import re
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple, Union
 import json
+import asyncio
+import hashlib
 import logging
+import sqlite3
 import time
-from datetime import datetime, timedelta
-import google.generativeai as genai
-from ratelimit import limits, sleep_and_retry
+import orjson
+from collections import deque
+from datetime import datetime
 from dotenv import load_dotenv
 from better_profanity import profanity
+from report import write_comments
 
 # Load environment variables from .env file
 load_dotenv()
@@ -17,13 +24,142 @@ load_dotenv()
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-profanity.load_censor_words()
+_profanity_loaded = False
+
+def load_profanity_words() -> None:
+    # Deferred until a pre-filter is actually built so importing this module stays cheap
+    global _profanity_loaded
+    if not _profanity_loaded:
+        profanity.load_censor_words()
+        _profanity_loaded = True
+
+OFFENSE_TYPES = ["hate speech", "toxicity", "profanity", "harassment", "none", "error"]
+
+# Column order of the partial and final result files
+RESULT_FIELDS = ["is_offensive", "offense_type", "explanation", "severity", "comment_id", "username", "original_comment"]
+
+# Gemini usually wraps its JSON in a ```json ... ``` fence
+_FENCE_RE = re.compile(r'```(?:json)?\s*(.*?)\s*```', re.DOTALL)
+
+# better_profanity splits words on anything other than letters, digits and "$'*@
+_TOKEN_CHAR = r"""(?:[^\W_]|["$'*@])"""
+_TOKEN_CHAR_RE = re.compile(_TOKEN_CHAR)
+
+def build_profanity_regex() -> re.Pattern:
+    load_profanity_words()
+
+    # One alternation over the censor list, expanding each character into the same
+    # look-alike variants better_profanity accepts (e.g. "a" also matches "@", "4")
+    def word_pattern(word: str) -> str:
+        return "".join(
+            "[" + "".join(map(re.escape, profanity.CHARS_MAPPING[char])) + "]" if char in profanity.CHARS_MAPPING
+            else re.escape(char)
+            for char in word
+        )
+
+    words = sorted({str(word) for word in profanity.CENSOR_WORDSET}, key=len, reverse=True)
+    return re.compile(
+        rf"(?<!{_TOKEN_CHAR})(?:" + "|".join(map(word_pattern, words)) + rf")(?!{_TOKEN_CHAR})",
+        re.IGNORECASE
+    )
+
+class ProfanityScreen:
+    """Aho-Corasick scan of case- and look-alike-folded text for candidate profanity.
+
+    Folding merges more spellings than better_profanity accepts, so a hit still has to
+    be confirmed by the exact regex, but a miss is final.
+    """
+
+    def __init__(self, automaton):
+        load_profanity_words()
+
+        # Merge every character with its look-alikes (which chain, e.g. a-@-o) into one
+        # representative so all accepted spellings of a word fold to the same string
+        groups = []
+        for char, variants in profanity.CHARS_MAPPING.items():
+            group = {char, *variants}
+            for other in [g for g in groups if g & group]:
+                group |= other
+                groups.remove(other)
+            groups.append(group)
+        self._fold = str.maketrans({char: min(group) for group in groups for char in group})
+
+        self._automaton = automaton
+        for word in {str(word).lower().translate(self._fold) for word in profanity.CENSOR_WORDSET}:
+            self._automaton.add_word(word, len(word))
+        self._automaton.make_automaton()
+
+    def might_contain_profanity(self, text: str) -> bool:
+        if not isinstance(text, str):
+            return False
+        # Folding maps token characters to token characters, so boundaries can be checked on the folded text
+        folded = text.lower().translate(self._fold)
+        for end, length in self._automaton.iter(folded):
+            start = end - length + 1
+            if ((start == 0 or not _TOKEN_CHAR_RE.match(folded[start - 1]))
+                    and (end == len(folded) - 1 or not _TOKEN_CHAR_RE.match(folded[end + 1]))):
+                return True
+        return False
+
+def build_profanity_screen() -> Optional[ProfanityScreen]:
+    try:
+        import ahocorasick
+    except ImportError:
+        return None
+    return ProfanityScreen(ahocorasick.Automaton())
+
+def parse_response(raw_text: str) -> List[Dict]:
+    match = _FENCE_RE.search(raw_text)
+    payload = match.group(1) if match else raw_text
+    # The prompt asks for JSON Lines, but accept a plain JSON array as well
+    if payload.lstrip().startswith("["):
+        return orjson.loads(payload)
+    return [orjson.loads(line) for line in payload.splitlines() if line.strip()]
+
+class ResponseTruncatedError(ValueError):
+    """Raised when Gemini stops a response at its output token limit."""
+
+class StreamingResultParser:
+    """Parses JSON Lines results while a streamed response is still arriving."""
 
-class RateLimit:
     def __init__(self):
+        self.results = []
+        self.valid = True
+        self._pending = ""
+
+    def feed(self, text: str) -> None:
+        self._pending += text
+        *lines, self._pending = self._pending.split("\n")
+        for line in lines:
+            self._parse_line(line)
+
+    def close(self) -> Optional[List[Dict]]:
+        # None means the model ignored the JSON Lines format; parse the full text instead
+        self._parse_line(self._pending)
+        self._pending = ""
+        return self.results if self.valid else None
+
+    def _parse_line(self, line: str) -> None:
+        line = line.strip()
+        if not self.valid or not line or line.startswith("```"):
+            return
+        try:
+            result = orjson.loads(line)
+        except orjson.JSONDecodeError:
+            self.valid = False
+            return
+        # A whole JSON array on one line is not JSON Lines; leave it to parse_response
+        if not isinstance(result, dict):
+            self.valid = False
+            return
+        self.results.append(result)
+
+class RateLimit:
+    def __init__(self, requests_per_minute: int = 15, requests_per_day: int = 50):
+        self.requests_per_minute = requests_per_minute
+        self.requests_per_day = requests_per_day
         self.requests_today = 0
-        self.last_request_time = None
-        self.requests_this_minute = 0
+        self.recent_requests = deque()
         self.day_start = datetime.now()
 
     def can_make_request(self) -> bool:
@@ -34,132 +170,204 @@ class RateLimit:
             self.requests_today = 0
             self.day_start = current_time
 
-        if self.requests_today >= 50:  
+        if self.requests_today >= self.requests_per_day:  
             return False
 
-        if self.last_request_time and (current_time - self.last_request_time) >= timedelta(minutes=1):
-            self.requests_this_minute = 0
+        # Forget requests that have left the rolling one-minute window
+        now = time.monotonic()
+        while self.recent_requests and now - self.recent_requests[0] >= 60:
+            self.recent_requests.popleft()
 
-        if self.requests_this_minute >= 15:
-            return False
-
-        return True
+        return len(self.recent_requests) < self.requests_per_minute
 
     def record_request(self):
-        current_time = datetime.now()
         self.requests_today += 1
-        self.requests_this_minute += 1
-        self.last_request_time = current_time
+        self.recent_requests.append(time.monotonic())
+
+    async def acquire(self) -> None:
+        # Token bucket: sleep only until the oldest request in the window expires.
+        # Nothing awaits between the final check and record_request, so concurrent
+        # batches can never overshoot the limit.
+        while not self.can_make_request():
+            if len(self.recent_requests) >= self.requests_per_minute:
+                await asyncio.sleep(60 - (time.monotonic() - self.recent_requests[0]))
+            else:
+                await asyncio.sleep(2)
+        self.record_request()
+
+class DiskCache:
+    """SQLite store of parsed results per comment and raw response text per prompt, keyed by SHA-256."""
+
+    def __init__(self, cache_dir: str = ".gemini_cache"):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.conn = sqlite3.connect(os.path.join(cache_dir, "cache.sqlite3"))
+        self.conn.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, raw_text TEXT NOT NULL)")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+
+    @staticmethod
+    def make_key(text: str) -> str:
+        return hashlib.sha256(str(text).encode("utf-8")).hexdigest()
+
+    def get_result(self, comment: str) -> Optional[Dict]:
+        row = self.conn.execute("SELECT value FROM results WHERE key = ?", (self.make_key(comment),)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set_result(self, comment: str, result: Dict) -> None:
+        self.conn.execute("INSERT OR REPLACE INTO results (key, value) VALUES (?, ?)",
+                          (self.make_key(comment), json.dumps(result)))
+
+    def get_response(self, prompt: str) -> Optional[str]:
+        row = self.conn.execute("SELECT raw_text FROM responses WHERE key = ?", (self.make_key(prompt),)).fetchone()
+        return row[0] if row else None
+
+    def set_response(self, prompt: str, raw_text: str) -> None:
+        self.conn.execute("INSERT OR REPLACE INTO responses (key, raw_text) VALUES (?, ?)",
+                          (self.make_key(prompt), raw_text))
+
+    def delete_response(self, prompt: str) -> None:
+        self.conn.execute("DELETE FROM responses WHERE key = ?", (self.make_key(prompt),))
+
+    def get_meta(self, key: str) -> Optional[str]:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str) -> None:
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def flush(self) -> None:
+        self.conn.commit()
 
 class CommentAnalyzer:
-    def __init__(self, data_path: str, api_key: str = None, max_batches: int = 50, use_prefilter: bool = True):
+    _PROMPT_TEMPLATE = """Analyze the following comments for offensive content. For each comment, classify it into one of these categories: hate speech, toxicity, profanity, harassment.
+
+Comments:
+{comments}
+
+For each comment, provide a JSON object with these fields:
+- is_offensive (boolean)
+- offense_type (string, must be one of: hate speech, toxicity, profanity, harassment, or none)
+- explanation (string)
+- severity (float between 0 and 1, where 1 is most severe)
+
+Return the results as JSON Lines: one compact JSON object per line, one line for each comment in the same order, with no surrounding array.
+"""
+
+    def __init__(self, data_path: str, api_key: str = None, max_batches: int = 50, use_prefilter: bool = True,
+                 use_cache: bool = True, cache_dir: str = ".gemini_cache", batch_size: int = 100):
         self.data_path = data_path
         self.data = None
         self.analyzed_data = None
         self.rate_limiter = RateLimit()
-        self.batch_size = 20  
+        self.batch_size = batch_size  
         self.max_batches = max_batches  
         self.use_prefilter = use_prefilter  
+        self.cache = DiskCache(cache_dir) if use_cache else None
+        # Comments per API call; starts at batch_size and shrinks if responses come back too large
+        # The cache remembers the size that worked after a run had to shrink, with the batch size it
+        # shrank from. A larger --batch-size ignores it, so an explicit request is always tried first
+        self.request_size = batch_size
+        self._shrunk = False
+        self._stored_request_size = None
+        stored_request_size = self.cache.get_meta("request_size") if self.cache else None
+        if stored_request_size and "/" in stored_request_size:
+            size, shrunk_from = (int(value) for value in stored_request_size.split("/"))
+            if batch_size <= shrunk_from:
+                self._stored_request_size = size
+                self.request_size = min(batch_size, size)
+        self._comment_cache: Dict[str, Dict] = {}
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._prompt_lock: Optional[asyncio.Lock] = None
+        self._prof_re = build_profanity_regex() if use_prefilter else None
+        self._prof_screen = build_profanity_screen() if use_prefilter else None
         
         if api_key:
+            # google.generativeai takes around half a second to import, so only pay for it here
+            import google.generativeai as genai
+            from google.api_core.exceptions import InvalidArgument
+            self._invalid_argument = InvalidArgument
             genai.configure(api_key=api_key)
             self.model = genai.GenerativeModel('gemini-2.0-flash')
         else:
             raise ValueError("Gemini API key not provided")
 
-    def pre_filter_comments(self, comments: List[str]) -> List[str]:
-        return [comment for comment in comments if profanity.contains_profanity(comment)]
+    def profanity_mask(self, comments: pd.Series) -> pd.Series:
+        if self._prof_re is None:
+            self._prof_re = build_profanity_regex()
+            self._prof_screen = build_profanity_screen()
+        if self._prof_screen is None:
+            return comments.str.contains(self._prof_re, na=False)
+
+        # With pyahocorasick installed, only comments the automaton flags reach the regex
+        candidates = comments.map(self._prof_screen.might_contain_profanity).astype(bool)
+        mask = pd.Series(False, index=comments.index)
+        mask[candidates] = comments[candidates].str.contains(self._prof_re, na=False)
+        return mask
+
+    def pre_filter_comments(self, comments: Union[List[str], pd.Series]) -> List[Tuple[int, str]]:
+        # Positions are kept so duplicate comments map back to the right rows
+        mask = self.profanity_mask(pd.Series(comments, dtype=object)).tolist()
+        return [(i, comment) for i, (comment, flagged) in enumerate(zip(comments, mask)) if flagged]
 
     def load_data(self) -> None:
         try:
-            self.data = pd.read_csv(self.data_path)
-            self.data.rename(columns={"tweet": "comment_text"}, inplace=True)
-            logging.info(f"Successfully loaded data with {len(self.data)} comments")
-            
             # Calculate maximum comments we can process based on max_batches
             max_comments = self.batch_size * self.max_batches
+
+            # Only the tweet column is used; one extra row tells us whether the file was truncated
+            try:
+                import polars as pl
+            except ImportError:
+                pl = None
+
+            if pl is not None:
+                # Polars parses the CSV on all cores instead of pandas' single-threaded reader
+                tweets = pl.read_csv(self.data_path, columns=["tweet"], n_rows=max_comments + 1)
+                self.data = pd.DataFrame({"comment_text": tweets.get_column("tweet").to_list()})
+            else:
+                self.data = pd.read_csv(self.data_path, usecols=["tweet"], nrows=max_comments + 1)
+                self.data.rename(columns={"tweet": "comment_text"}, inplace=True)
+
             if len(self.data) > max_comments:
-                logging.warning(f"Dataset contains {len(self.data)} comments, but we can only process {max_comments} comments ({self.max_batches} batches × {self.batch_size} comments per batch).")
+                logging.warning(f"Dataset contains more than {max_comments} comments, but we can only process {max_comments} comments ({self.max_batches} batches × {self.batch_size} comments per batch).")
                 logging.warning(f"Only the first {max_comments} comments will be processed.")
                 self.data = self.data.head(max_comments)
+            logging.info(f"Successfully loaded data with {len(self.data)} comments")
+
+            # The pre-filter is deterministic, so flag every comment once up front
+            if self.use_prefilter:
+                self.data['_may_be_offensive'] = self.profanity_mask(self.data['comment_text'])
             
-            logging.info("\nData Preview:")
-            print(self.data.head())
-            logging.info("\nData Summary:")
-            print(self.data.info())
+            # info() scans every column, so only build the preview when it will be shown
+            if logging.getLogger().isEnabledFor(logging.DEBUG):
+                logging.debug("\nData Preview:\n%s", self.data.head())
+                summary = io.StringIO()
+                self.data.info(buf=summary)
+                logging.debug("\nData Summary:\n%s", summary.getvalue())
         except Exception as e:
             logging.error(f"Error loading data: {str(e)}")
             raise
 
     def build_batch_prompt(self, comments: List[str]) -> str:
-        comments_text = "\n".join([f"{i+1}. '{comment}'" for i, comment in enumerate(comments)])
-        return f"""Analyze the following comments for offensive content. For each comment, classify it into one of these categories: hate speech, toxicity, profanity, harassment.
-
-Comments:
-{comments_text}
-
-For each comment, provide a JSON object with these fields:
-- is_offensive (boolean)
-- offense_type (string, must be one of: hate speech, toxicity, profanity, harassment, or none)
-- explanation (string)
-- severity (float between 0 and 1, where 1 is most severe)
-
-Return the results as a JSON array of objects, one for each comment in the same order.
-"""
-
-    def process_batch(self, comments: List[str]) -> List[Dict]:
-        if self.use_prefilter:
-            # Pre-filter comments
-            potentially_offensive = self.pre_filter_comments(comments)
-            
-            if not potentially_offensive:
-                # If no potentially offensive comments, return default results
-                return [{
-                    "is_offensive": False,
-                    "offense_type": "none",
-                    "explanation": "No profanity detected by pre-filter",
-                    "severity": 0.0
-                } for _ in range(len(comments))]
-        else:
-            potentially_offensive = comments
+        # repr() quotes each comment safely even when it contains quotes or newlines
+        comments_text = "\n".join(f"{i}. {comment!r}" for i, comment in enumerate(comments, 1))
+        return self._PROMPT_TEMPLATE.format(comments=comments_text)
 
+    async def _request_analysis(self, comments: List[str]) -> Dict[str, Dict]:
         max_retries = 3
         retry_count = 0
         last_error = None
 
         while retry_count < max_retries:
+            # Comments answered by an earlier attempt (or an earlier half of a split chunk) are not re-sent
+            pending = [comment for comment in comments if comment not in self._comment_cache]
+            # Send at most request_size comments per API call. Read the size once, since
+            # a concurrent batch may shrink it while these chunks are in flight
+            size = self.request_size
             try:
-                while not self.rate_limiter.can_make_request():
-                    time.sleep(2)  
-
-                prompt = self.build_batch_prompt(potentially_offensive)
-                response = self.model.generate_content(prompt)
-                self.rate_limiter.record_request()
-
-                cleaned_text = response.text.strip()
-                if cleaned_text.startswith("```json"):
-                    cleaned_text = cleaned_text[7:]
-                if cleaned_text.endswith("```"):
-                    cleaned_text = cleaned_text[:-3]
-
-                results = json.loads(cleaned_text)
-                
-                final_results = []
-                result_idx = 0
-                
-                for comment in comments:
-                    if comment in potentially_offensive:
-                        final_results.append(results[result_idx])
-                        result_idx += 1
-                    else:
-                        final_results.append({
-                            "is_offensive": False,
-                            "offense_type": "none",
-                            "explanation": "No profanity detected by pre-filter" if self.use_prefilter else "Analyzed without pre-filter",
-                            "severity": 0.0
-                        })
-                
-                return final_results
+                for start in range(0, len(pending), size):
+                    await self._request_chunk(pending[start:start + size])
+                return {comment: self._comment_cache[comment] for comment in comments}
 
             except Exception as e:
                 retry_count += 1
@@ -167,71 +375,235 @@ Return the results as a JSON array of objects, one for each comment in the same
                 logging.error(f"Error processing batch (attempt {retry_count}/{max_retries}): {last_error}")
                 
                 if retry_count < max_retries:
-                    # Ask user if they want to retry
-                    user_input = input(f"Request failed. Retry? (y/n) [Attempt {retry_count}/{max_retries}]: ").lower()
+                    # Ask user if they want to retry. The prompt runs in a thread so other streams keep
+                    # going, and the lock stops concurrent failures from asking at the same time
+                    async with self._prompt_lock:
+                        user_input = (await asyncio.to_thread(
+                            input, f"Request failed. Retry? (y/n) [Attempt {retry_count}/{max_retries}]: ")).lower()
                     if user_input != 'y':
                         logging.info("User chose to stop retrying. Saving partial results...")
                         break
                     logging.info(f"Retrying request (attempt {retry_count + 1}/{max_retries})...")
-                    time.sleep(5) 
+                    await asyncio.sleep(5) 
 
         logging.error(f"Failed to process batch after {retry_count} attempts. Last error: {last_error}")
-        return [{
+        return {comment: self._comment_cache.get(comment) or {
             "is_offensive": False,
             "offense_type": "error",
             "explanation": f"Error in analysis after {retry_count} attempts: {last_error}",
             "severity": 0.0
-        } for _ in range(len(comments))]
+        } for comment in comments}
+
+    def _is_oversize(self, error: Exception) -> bool:
+        # Only a response cut off at the token limit, or a prompt rejected for exceeding it,
+        # means the request was too large. Other invalid arguments (e.g. a bad API key) are not
+        if isinstance(error, ResponseTruncatedError):
+            return True
+        message = str(error).lower()
+        return isinstance(error, self._invalid_argument) and "token" in message and ("exceed" in message or "limit" in message)
+
+    async def _request_chunk(self, comments: List[str], splits: int = 0) -> Dict[str, Dict]:
+        max_splits = 3
+        prompt = self.build_batch_prompt(comments)
+        try:
+            raw_text = self.cache.get_response(prompt) if self.cache else None
+            if raw_text is None:
+                await self.rate_limiter.acquire()
+                # Stream the response and parse each result line as it arrives
+                response = await self.model.generate_content_async(prompt, stream=True)
+                parser = StreamingResultParser()
+                parts = []
+                truncated = False
+                async for chunk in response:
+                    parts.append(chunk.text)
+                    parser.feed(chunk.text)
+                    candidates = getattr(chunk, "candidates", None)
+                    if candidates and getattr(candidates[0].finish_reason, "name", None) == "MAX_TOKENS":
+                        truncated = True
+                if truncated:
+                    raise ResponseTruncatedError(f"Response for {len(comments)} comments hit the output token limit")
+                raw_text = "".join(parts)
+                if self.cache:
+                    self.cache.set_response(prompt, raw_text)
+                results = parser.close()
+                if results is None:
+                    results = parse_response(raw_text)
+            else:
+                results = parse_response(raw_text)
+
+            if len(results) != len(comments):
+                raise ValueError(f"Expected {len(comments)} results but received {len(results)}")
+            if not all(isinstance(result, dict) for result in results):
+                raise ValueError("Response contained results that are not JSON objects")
+
+        except Exception as e:
+            # Drop the stored response so the retry asks the API again
+            if self.cache:
+                self.cache.delete_response(prompt)
+            if not (self._is_oversize(e) and len(comments) > 1 and splits < max_splits):
+                raise
+            # The request was too large: send this chunk again as two halves, a bounded number
+            # of times, and use the smaller size for the rest of this run
+            mid = len(comments) // 2
+            self.request_size = min(self.request_size, len(comments) - mid)
+            self._shrunk = True
+            logging.warning(f"Request with {len(comments)} comments was too large ({e}); retrying in halves")
+            analyzed = await self._request_chunk(comments[:mid], splits + 1)
+            analyzed.update(await self._request_chunk(comments[mid:], splits + 1))
+            return analyzed
+
+        for comment, result in zip(comments, results):
+            self._comment_cache[comment] = result
+            if self.cache:
+                self.cache.set_result(comment, result)
+        # A full-size request worked after this run had to shrink, so later runs can start from this size
+        if self.cache and self._shrunk and len(comments) == self.request_size and len(comments) != self._stored_request_size:
+            self._stored_request_size = len(comments)
+            self.cache.set_meta("request_size", f"{len(comments)}/{self.batch_size}")
+        return dict(zip(comments, results))
+
+    async def process_batch(self, batch: pd.DataFrame) -> List[Dict]:
+        comments = batch['comment_text'].tolist()
+        if self.use_prefilter:
+            # Pre-filter comments using the mask computed in load_data
+            flags = batch['_may_be_offensive'].tolist()
+            potentially_offensive = [(i, comment) for i, comment in enumerate(comments) if flags[i]]
+            
+            if not potentially_offensive:
+                # If no potentially offensive comments, return default results
+                return [{
+                    "is_offensive": False,
+                    "offense_type": "none",
+                    "explanation": "No profanity detected by pre-filter",
+                    "severity": 0.0
+                } for _ in range(len(comments))]
+        else:
+            potentially_offensive = list(enumerate(comments))
+
+        # Only unique comments that have never been analyzed before go to the API
+        analyzed = {}
+        unique_comments = list(dict.fromkeys(comment for _, comment in potentially_offensive))
+        for comment in unique_comments:
+            cached_result = self._comment_cache.get(comment)
+            if cached_result is None and self.cache:
+                cached_result = self.cache.get_result(comment)
+                if cached_result is not None:
+                    self._comment_cache[comment] = cached_result
+            if cached_result is not None:
+                analyzed[comment] = cached_result
+        # Comments already sent by a concurrent batch are awaited rather than re-sent
+        shared = {comment: self._in_flight[comment] for comment in unique_comments
+                  if comment not in analyzed and comment in self._in_flight}
+        misses = [comment for comment in unique_comments if comment not in analyzed and comment not in shared]
+        loop = asyncio.get_running_loop()
+        for comment in misses:
+            self._in_flight[comment] = loop.create_future()
+
+        error = None
+        try:
+            if misses:
+                analyzed.update(await self._request_analysis(misses))
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            # Always settle the shared futures, otherwise batches waiting on them hang forever
+            for comment in misses:
+                future = self._in_flight.pop(comment)
+                if comment in analyzed:
+                    future.set_result(analyzed[comment])
+                else:
+                    future.set_exception(RuntimeError(f"Request shared with another batch failed: {error}"))
+                    # Mark it retrieved so asyncio does not warn when no other batch was waiting
+                    future.exception()
+        for comment, future in shared.items():
+            analyzed[comment] = await future
+
+        # Copy so per-row fields added by the caller never leak between duplicates
+        offensive_idx = {i: dict(analyzed[comment]) for i, comment in potentially_offensive}
+        return [offensive_idx.get(i) or {
+            "is_offensive": False,
+            "offense_type": "none",
+            "explanation": "No profanity detected by pre-filter" if self.use_prefilter else "Analyzed without pre-filter",
+            "severity": 0.0
+        } for i in range(len(comments))]
 
     def analyze_all_comments(self) -> None:
         if self.data is None:
             raise ValueError("Data not loaded. Call load_data() first.")
 
+        asyncio.run(self._analyze_all_comments())
+
+    async def _analyze_all_comments(self) -> None:
         results = []
         total_comments = len(self.data)
         num_batches = min(self.max_batches, (total_comments + self.batch_size - 1) // self.batch_size)
         max_comments = num_batches * self.batch_size
+        # Batches run concurrently; the rate limiter alone decides when requests go out
+        semaphore = asyncio.Semaphore(self.rate_limiter.requests_per_minute)
+        self._prompt_lock = asyncio.Lock()
 
         logging.info(f"\nStarting analysis with {num_batches} batches ({max_comments} comments)")
-        
-        for batch_num in range(num_batches):
+
+        async def run_batch(batch_num: int) -> None:
             start_idx = batch_num * self.batch_size
             end_idx = min(start_idx + self.batch_size, total_comments)
-            batch_comments = self.data['comment_text'].iloc[start_idx:end_idx].tolist()
-            
-            logging.info(f"\nProcessing Batch {batch_num + 1}/{num_batches}")
-            logging.info(f"Time: {datetime.now().strftime('%H:%M:%S')}")
-            logging.info(f"Processing comments {start_idx + 1} to {end_idx} of {max_comments}")
-            
-            try:
-                batch_results = self.process_batch(batch_comments)
-                
-                for i, result in enumerate(batch_results):
-                    result['comment_id'] = start_idx + i
-                    result['username'] = f"user_{start_idx + i}"
-                    result['original_comment'] = batch_comments[i]
-                
-                results.extend(batch_results)
-                
-                self.analyzed_data = pd.DataFrame(results)
-                self.save_results("partial_results.csv")
-                logging.info(f"Saved {len(results)} results so far")
-                
-            except Exception as e:
-                logging.error(f"Error processing batch {batch_num + 1}: {str(e)}")
-                logging.info("Saving partial results before continuing...")
-                self.analyzed_data = pd.DataFrame(results)
-                self.save_results("partial_results.csv")
-                logging.info(f"Saved {len(results)} results before error")
-                continue
-            
-            if batch_num < num_batches - 1:
-                logging.info("Waiting 5 seconds before next batch...")
-                time.sleep(5)
-
-        self.analyzed_data = pd.DataFrame(results)
+            batch = self.data.iloc[start_idx:end_idx]
+            batch_comments = batch['comment_text'].tolist()
+
+            async with semaphore:
+                logging.info(f"\nProcessing Batch {batch_num + 1}/{num_batches}")
+                logging.info(f"Time: {datetime.now().strftime('%H:%M:%S')}")
+                logging.info(f"Processing comments {start_idx + 1} to {end_idx} of {max_comments}")
+
+                try:
+                    batch_results = await self.process_batch(batch)
+
+                    for i, result in enumerate(batch_results):
+                        result['comment_id'] = start_idx + i
+                        result['username'] = f"user_{start_idx + i}"
+                        result['original_comment'] = batch_comments[i]
+
+                    results.extend(batch_results)
+
+                    # Append only this batch; earlier batches are already on disk
+                    writer.writerows(batch_results)
+                    partial_file.flush()
+                    if self.cache:
+                        self.cache.flush()
+                    logging.info(f"Saved {len(results)} results so far")
+
+                except Exception as e:
+                    logging.error(f"Error processing batch {batch_num + 1}: {str(e)}")
+                    logging.info(f"Continuing with {len(results)} results already saved to partial_results.csv")
+
+        with open("partial_results.csv", "w", newline="", encoding="utf-8") as partial_file:
+            writer = csv.DictWriter(partial_file, fieldnames=RESULT_FIELDS, extrasaction="ignore")
+            writer.writeheader()
+            await asyncio.gather(*(run_batch(batch_num) for batch_num in range(num_batches)))
+
+        # Batches finish out of order, so restore input order before building the final frame
+        results.sort(key=lambda result: result['comment_id'])
+        self.analyzed_data = self._results_frame(results)
         logging.info(f"Analysis completed. Processed {len(results)} comments in {num_batches} batches.")
 
+    @staticmethod
+    def _results_frame(results: List[Dict]) -> pd.DataFrame:
+        frame = pd.DataFrame(results)
+        if frame.empty:
+            return frame
+
+        # Low-cardinality labels as categories make value_counts and equality filters integer ops.
+        # Labels outside the known set are kept as extra categories rather than turned into NaN
+        extra_types = sorted(set(frame['offense_type'].dropna().astype(str)) - set(OFFENSE_TYPES))
+        frame['offense_type'] = pd.Categorical(frame['offense_type'], categories=OFFENSE_TYPES + extra_types)
+        # astype('bool') would turn NaN and the string "false" into True, so map strings explicitly
+        frame['is_offensive'] = frame['is_offensive'].map(
+            lambda value: {"true": True, "false": False}.get(value.strip().lower()) if isinstance(value, str) else value
+        ).fillna(False).astype('bool')
+        frame['severity'] = frame['severity'].astype('float32')
+        return frame
+
     def generate_report(self) -> None:
         if self.analyzed_data is None:
             raise ValueError("No analyzed data available. Run analyze_all_comments() first.")
@@ -239,68 +611,78 @@ Return the results as a JSON array of objects, one for each comment in the same
         total_comments = len(self.analyzed_data)
         offensive_comments = self.analyzed_data[self.analyzed_data['is_offensive'] == True]
         
-        print("\n=== Analysis Report ===")
-        print(f"Total Comments Analyzed: {total_comments}")
-        print(f"Offensive Comments: {len(offensive_comments)}")
+        logging.info("\n=== Analysis Report ===")
+        logging.info("Total Comments Analyzed: %d", total_comments)
+        logging.info("Offensive Comments: %d", len(offensive_comments))
         
-        print("\nOffense Type Breakdown:")
+        logging.info("\nOffense Type Breakdown:")
         offense_types = offensive_comments['offense_type'].value_counts()
+        offense_types = offense_types[offense_types > 0]
         for offense_type, count in offense_types.items():
-            print(f"- {offense_type}: {count}")
+            logging.info("- %s: %d", offense_type, count)
 
     def save_results(self, output_path: str) -> None:
         if self.analyzed_data is None:
             raise ValueError("No analyzed data available. Run analyze_all_comments() first.")
 
         self.analyzed_data.to_csv(output_path, index=False)
+        if self.cache:
+            self.cache.flush()
         logging.info(f"Results saved to {output_path}")
 
-    # def display_top_severe_comments(self, n: int = 10, offense_type: str = None) -> None:
-    #     if self.analyzed_data is None:
-    #         raise ValueError("No analyzed data available. Run analyze_all_comments() first.")
-
-    #     if offense_type:
-    #         filtered_data = self.analyzed_data[self.analyzed_data['offense_type'] == offense_type]
-    #         if len(filtered_data) == 0:
-    #             print(f"No comments found with offense type: {offense_type}")
-    #             return
-    #         top_comments = filtered_data.nlargest(n, 'severity')
-    #         print(f"\nTop {n} Most Severe Comments (Offense Type: {offense_type}):")
-    #     else:
-    #         top_comments = self.analyzed_data.nlargest(n, 'severity')
-    #         print(f"\nTop {n} Most Severe Comments:")
-
-    #     print("-" * 80)
-    #     for idx, row in top_comments.iterrows():
-    #         print(f"\nComment ID: {row['comment_id']}")
-    #         print(f"Username: {row['username']}")
-    #         print(f"Comment: {row['original_comment']}")
-    #         print(f"Offense Type: {row['offense_type']}")
-    #         print(f"Severity: {row['severity']:.2f}")
-    #         print(f"Explanation: {row['explanation']}")
-    #         print("-" * 80)
+    @property
+    def analyzed_data(self) -> Optional[pd.DataFrame]:
+        return self._analyzed_data
+
+    @analyzed_data.setter
+    def analyzed_data(self, value: Optional[pd.DataFrame]) -> None:
+        self._analyzed_data = value
+        # New results invalidate the cached severity rankings
+        self.__dict__.pop('_by_type', None)
+        self.__dict__.pop('_by_severity', None)
+
+    @functools.cached_property
+    def _by_type(self) -> Dict[str, pd.DataFrame]:
+        return {offense_type: group.sort_values('severity', ascending=False, kind='stable')
+                for offense_type, group in self.analyzed_data.groupby('offense_type', sort=False, observed=True)}
+
+    @functools.cached_property
+    def _by_severity(self) -> pd.DataFrame:
+        return self.analyzed_data.sort_values('severity', ascending=False, kind='stable')
+
+    def display_top_severe_comments(self, n: int = 10, offense_type: str = None) -> Optional[pd.DataFrame]:
+        if self.analyzed_data is None:
+            raise ValueError("No analyzed data available. Run analyze_all_comments() first.")
+
+        if offense_type:
+            if offense_type not in self._by_type:
+                print(f"No comments found with offense type: {offense_type}")
+                return None
+            top_comments = self._by_type[offense_type].head(n)
+            print(f"\nTop {n} Most Severe Comments (Offense Type: {offense_type}):")
+        else:
+            top_comments = self._by_severity.head(n)
+            print(f"\nTop {n} Most Severe Comments:")
+
+        print("-" * 80)
+        write_comments(top_comments)
+        return top_comments
 
     def filter_by_offense_type(self, offense_type: str) -> None:
         if self.analyzed_data is None:
             raise ValueError("No analyzed data available. Run analyze_all_comments() first.")
 
-        filtered_comments = self.analyzed_data[self.analyzed_data['offense_type'] == offense_type]
+        filtered_comments = self._by_type.get(offense_type)
         
-        if len(filtered_comments) == 0:
+        if filtered_comments is None:
             print(f"No comments found with offense type: {offense_type}")
             return
 
         print(f"\nComments with offense type '{offense_type}':")
         print(f"Total count: {len(filtered_comments)}")
         print("-" * 80)
-        
-        for idx, row in filtered_comments.iterrows():
-            print(f"\nComment ID: {row['comment_id']}")
-            print(f"Username: {row['username']}")
-            print(f"Comment: {row['original_comment']}")
-            print(f"Severity: {row['severity']:.2f}")
-            print(f"Explanation: {row['explanation']}")
-            print("-" * 80)
+
+        write_comments(filtered_comments, show_type=False)
 
 if __name__ == "__main__":
     # Get API key from environment variable
@@ -0,0 +1,18 @@
+import sys
+import pandas as pd
+
+
+def write_comments(comments: pd.DataFrame, show_type: bool = True) -> None:
+    # One write for the whole listing instead of six prints per row
+    columns = ['comment_id', 'username', 'original_comment', 'offense_type', 'severity', 'explanation']
+    rows = comments[columns if show_type else [col for col in columns if col != 'offense_type']].to_dict('records')
+    sys.stdout.write("".join(
+        f"\nComment ID: {row['comment_id']}\n"
+        f"Username: {row['username']}\n"
+        f"Comment: {row['original_comment']}\n"
+        + (f"Offense Type: {row['offense_type']}\n" if show_type else "") +
+        f"Severity: {row['severity']:.2f}\n"
+        f"Explanation: {row['explanation']}\n"
+        f"{'-' * 80}\n"
+        for row in rows
+    ))
@@ -1,10 +1,13 @@
 import os
+import re
 import json
+import orjson
 from dotenv import load_dotenv
 import google.generativeai as genai
 import pandas as pd
-import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from ratelimit import limits, sleep_and_retry
 
 # Load .env
 load_dotenv()
@@ -21,9 +24,13 @@ model = genai.GenerativeModel("gemini-2.0-flash")
 df = pd.read_csv("labeled_data.csv")
 df.rename(columns={"tweet": "comment_text"}, inplace=True)
 
+# Gemini usually wraps its JSON in a ```json ... ``` fence
+_FENCE_RE = re.compile(r'```(?:json)?\s*(.*?)\s*```', re.DOTALL)
+
 # Choose how many test comments to send
 NUM_COMMENTS_TO_TEST = 15  # This will process 150 comments (15 batches of 10)
 BATCH_SIZE = 10
+MAX_WORKERS = 4  # Concurrent requests; the rate limit below still caps them at 15 per minute
 
 # Prompt template for batch processing
 def build_batch_prompt(comments):
@@ -42,6 +49,8 @@ For each comment, provide a JSON object with these fields:
 Return the results as a JSON array of objects, one for each comment in the same order.
 """
 
+@sleep_and_retry
+@limits(calls=15, period=60)
 def process_batch(comments):
     """Process a batch of comments and return the results."""
     try:
@@ -49,13 +58,8 @@ def process_batch(comments):
         response = model.generate_content(prompt)
         
         # Clean and parse the response
-        cleaned_text = response.text.strip()
-        if cleaned_text.startswith("```json"):
-            cleaned_text = cleaned_text[7:]
-        if cleaned_text.endswith("```"):
-            cleaned_text = cleaned_text[:-3]
-        
-        results = json.loads(cleaned_text)
+        match = _FENCE_RE.search(response.text)
+        results = orjson.loads(match.group(1) if match else response.text)
         return results
     except Exception as e:
         print(f"❌ Error processing batch: {e}")
@@ -70,18 +74,20 @@ def process_batch(comments):
 total_comments = NUM_COMMENTS_TO_TEST * BATCH_SIZE
 print(f"\n🔹 Processing {total_comments} comments in {NUM_COMMENTS_TO_TEST} batches of {BATCH_SIZE}...\n")
 
+# Requests spend nearly all their time waiting on the network, so run them on a thread pool
+batches = [df["comment_text"].iloc[batch_num * BATCH_SIZE:(batch_num + 1) * BATCH_SIZE].tolist()
+           for batch_num in range(NUM_COMMENTS_TO_TEST)]
+print(f"⏰ {datetime.now().strftime('%H:%M:%S')}")
+with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+    batch_results_list = list(executor.map(process_batch, batches))
+
 all_results = []
-for batch_num in range(NUM_COMMENTS_TO_TEST):
+for batch_num, (batch_comments, batch_results) in enumerate(zip(batches, batch_results_list)):
     start_idx = batch_num * BATCH_SIZE
-    end_idx = start_idx + BATCH_SIZE
-    batch_comments = df["comment_text"].iloc[start_idx:end_idx].tolist()
-    
-    print(f"\n📦 Processing Batch {batch_num + 1}/{NUM_COMMENTS_TO_TEST}")
-    print(f"⏰ {datetime.now().strftime('%H:%M:%S')}")
-    
-    batch_results = process_batch(batch_comments)
     all_results.extend(batch_results)
     
+    print(f"\n📦 Batch {batch_num + 1}/{NUM_COMMENTS_TO_TEST}")
+    
     # Print results for this batch
     for i, (comment, result) in enumerate(zip(batch_comments, batch_results)):
         print(f"\n🔹 Comment {start_idx + i + 1}:")
@@ -90,11 +96,6 @@ for batch_num in range(NUM_COMMENTS_TO_TEST):
         print(f"   Type: {result['offense_type']}")
         print(f"   Severity: {result['severity']:.2f}")
         print(f"   Explanation: {result['explanation']}")
-    
-    # Add delay between batches to respect rate limits
-    if batch_num < NUM_COMMENTS_TO_TEST - 1:
-        print("\n⏳ Waiting 5 seconds before next batch...")
-        time.sleep(5)
 
 # Print summary
 print("\n📊 Summary:")
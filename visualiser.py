@@ -1,25 +1,226 @@
 import pandas as pd
+import matplotlib
+# Charts are only ever saved to PNG, so skip GUI backends entirely
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 import seaborn as sns
 import numpy as np
+from typing import Dict, List
 from datetime import datetime
 import os
+import csv
+import sys
+import io
+import contextlib
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from report import write_comments
+
+COLS = ['comment_id', 'username', 'original_comment', 'is_offensive', 'offense_type', 'severity', 'explanation']
+DTYPES = {'comment_id': 'int64', 'is_offensive': 'bool', 'offense_type': 'category', 'severity': 'float32'}
+
+# Fast zlib level for the PNGs: encoding dominates savefig time and the files are only slightly larger
+SAVEFIG_KWARGS = {'pil_kwargs': {'compress_level': 1}}
+
+# Charts drawn by generate_all_visualizations, with the line printed once each is saved
+PLOTS = [
+    ('plot_offensive_distribution', "✓ Generated offensive distribution pie chart"),
+    ('plot_offense_types', "✓ Generated offense types bar chart"),
+    ('plot_severity_distribution', "✓ Generated severity distribution histogram"),
+    ('plot_offense_type_severity', "✓ Generated offense type severity box plot"),
+    ('plot_top_offensive_comments', "✓ Generated top offensive comments chart"),
+    ('plot_offense_type_heatmap', "✓ Generated offense type heatmap")
+]
+
+# Colorbars added to an axes, so _prepare_axes can remove them before the axes is reused
+_COLORBARS = weakref.WeakKeyDictionary()
+
+def _read_csv(path: str) -> pd.DataFrame:
+    # Only request columns the file actually has, so comparison files may omit display columns
+    with open(path, newline='', encoding='utf-8') as f:
+        columns = [col for col in next(csv.reader(f), []) if col in COLS]
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pacsv
+    except ImportError:
+        return pd.read_csv(path, usecols=columns, dtype=DTYPES)
+
+    # pyarrow's reader parses column blocks on multiple threads
+    column_types = {
+        'comment_id': pa.int64(),
+        'is_offensive': pa.bool_(),
+        'offense_type': pa.dictionary(pa.int32(), pa.string()),
+        'severity': pa.float32()
+    }
+    try:
+        # Comments and explanations can contain quoted newlines
+        tbl = pacsv.read_csv(path, parse_options=pacsv.ParseOptions(newlines_in_values=True),
+                             convert_options=pacsv.ConvertOptions(
+            column_types={col: t for col, t in column_types.items() if col in columns},
+            include_columns=columns,
+            strings_can_be_null=True
+        ))
+    except pa.ArrowInvalid:
+        # Anything pyarrow cannot parse still goes through pandas
+        return pd.read_csv(path, usecols=columns, dtype=DTYPES)
+    return tbl.to_pandas(split_blocks=True, self_destruct=True)
+
+def _category_table(columns: Dict[str, pd.Series], masks: List[np.ndarray]) -> pd.DataFrame:
+    # Count each masked categorical column against one shared label set, so the table needs no alignment
+    labels = pd.Index([])
+    for col in columns.values():
+        labels = labels.union(col.cat.categories, sort=False)
+    counts = []
+    for col, mask in zip(columns.values(), masks):
+        codes = col.cat.codes.to_numpy()[mask]
+        # -1 marks missing values
+        codes = labels.get_indexer(col.cat.categories)[codes[codes >= 0]]
+        counts.append(np.bincount(codes, minlength=len(labels)))
+    table = pd.DataFrame(np.column_stack(counts), index=labels, columns=list(columns))
+    return table[table.to_numpy().any(axis=1)]
+
+def _top_severity(df: pd.DataFrame, n: int) -> pd.DataFrame:
+    # Same rows and order as df.nlargest(n, 'severity'), using an O(N) partition instead of a sort
+    sev = df['severity'].to_numpy()
+    if n <= 0:
+        return df.iloc[:0]
+    missing = np.isnan(sev)
+    idx = np.flatnonzero(~missing)
+    if n < len(idx):
+        vals = sev[idx]
+        kth = np.partition(vals, len(vals) - n)[len(vals) - n]
+        above = idx[vals > kth]
+        # nlargest keeps the earliest rows among ties at the cut-off
+        ties = idx[vals == kth][:n - len(above)]
+        idx = np.sort(np.concatenate([above, ties]))
+    idx = idx[np.argsort(-sev[idx], kind='stable')]
+    if len(idx) < n:
+        # Like nlargest, pad a short result with the first rows lacking a severity
+        idx = np.concatenate([idx, np.flatnonzero(missing)[:n - len(idx)]])
+    return df.iloc[idx]
+
+def _gaussian_kde(values: np.ndarray, grid: np.ndarray) -> np.ndarray:
+    # Binned Gaussian KDE with Scott's bandwidth: histogram onto the evenly spaced grid, then convolve
+    bw = values.std(ddof=1) * len(values) ** (-1 / 5)
+    step = grid[1] - grid[0]
+    counts, _ = np.histogram(values, bins=len(grid), range=(grid[0] - step / 2, grid[-1] + step / 2))
+    half = int(np.ceil(4 * bw / step))
+    kernel = np.exp(-0.5 * (np.arange(-half, half + 1) * step / bw) ** 2) / (bw * np.sqrt(2 * np.pi))
+    return np.convolve(counts, kernel)[half:half + len(grid)] / len(values)
+
+def _shrink(df: pd.DataFrame) -> pd.DataFrame:
+    # Narrow dtypes so every mask, groupby and histogram moves less memory
+    if 'severity' in df:
+        df['severity'] = pd.to_numeric(df['severity'], downcast='float')
+    for col in ('offense_type', 'username'):
+        # Only repeated labels are worth storing as category codes
+        if col in df and df[col].dtype != 'category' and df[col].nunique() <= len(df) // 2:
+            df[col] = df[col].astype('category')
+    return df
+
+def _prepare_axes(ax, figsize):
+    # Without an axes, open a new figure. Otherwise draw into the caller's axes, resetting the state an
+    # earlier chart may have left there: the pie's aspect and frame, rotated ticks, the heatmap's colorbar.
+    # Only a figure holding nothing but this axes is resized; a caller's grid keeps its layout
+    if ax is None:
+        return plt.figure(figsize=figsize).add_subplot()
+    colorbar = _COLORBARS.pop(ax, None)
+    if colorbar is not None:
+        colorbar.remove()
+    ax.clear()
+    ax.set_aspect('auto')
+    ax.set_frame_on(True)
+    ax.tick_params(labelrotation=0)
+    subplotspec = ax.get_subplotspec()
+    if subplotspec is not None:
+        ax.set_position(subplotspec.get_position(ax.figure))
+    if ax.figure.axes == [ax]:
+        ax.figure.set_size_inches(figsize)
+    return ax
+
+def _hist_bars(ax, values: np.ndarray, bins: int = 20):
+    counts, edges = np.histogram(values, bins=bins)
+    ax.bar(edges[:-1], counts, width=np.diff(edges), align='edge', alpha=0.75, edgecolor='white')
+    return counts, edges
+
+def _annotated_heatmap(ax, frame: pd.DataFrame, fmt: str):
+    # imshow plus one label per cell, in black or white depending on the cell's luminance
+    values = frame.to_numpy()
+    im = ax.imshow(values.astype(float), cmap='YlOrRd', aspect='auto')
+    _COLORBARS[ax] = ax.figure.colorbar(im, ax=ax)
+    rgb = im.cmap(im.norm(values.astype(float)))[..., :3]
+    lum = np.where(rgb <= 0.03928, rgb / 12.92, ((rgb + 0.055) / 1.055) ** 2.4) @ [0.2126, 0.7152, 0.0722]
+    for (i, j), value in np.ndenumerate(values):
+        ax.text(j, i, format(value, fmt), ha='center', va='center', color='black' if lum[i, j] > 0.408 else 'white')
+    ax.set_xticks(range(values.shape[1]), labels=[str(col) for col in frame.columns])
+    ax.set_yticks(range(values.shape[0]), labels=[str(idx) for idx in frame.index], rotation=90, va='center')
+    ax.set_xlabel(frame.columns.name or '')
+    ax.set_ylabel(frame.index.name or '')
+    ax.grid(False)
+
+def _save_axes(ax, filename: str, close: bool, tight: bool = True):
+    if tight:
+        ax.figure.tight_layout()
+    ax.figure.savefig(filename, **SAVEFIG_KWARGS)
+    if close:
+        plt.close(ax.figure)
+
+def _load(path: str) -> pd.DataFrame:
+    # Parse the CSV once and reuse a typed Parquet copy until the CSV is rewritten
+    cache = path + '.parquet'
+    if os.path.exists(cache) and os.path.getmtime(cache) >= os.path.getmtime(path):
+        # Map the cache file instead of copying it through a read buffer
+        df = pd.read_parquet(cache, engine='pyarrow', memory_map=True)
+    else:
+        df = _shrink(_read_csv(path))
+        try:
+            df.to_parquet(cache, engine='pyarrow', compression='snappy')
+        except (ImportError, OSError):
+            pass
+    # Build the comment_id index once so comparisons join on it instead of hashing per call
+    return df.set_index('comment_id', drop=False).sort_index()
 
 class HateSpeechVisualizer:
     def __init__(self, data_path: str, original_data_path: str = None):
         self.data_path = data_path
-        self.original_data_path = original_data_path
-        self.data = pd.read_csv(data_path)
-        self.original_data = pd.read_csv(original_data_path) if original_data_path else None
+        self.original_data_path = None
+        self.data = _load(data_path)
+        # Every severity chart works on the offensive rows only, so mask them once
+        self._offensive = self.data.loc[
+            self.data['is_offensive'].to_numpy(),
+            ['offense_type', 'severity', 'original_comment', 'username', 'comment_id', 'explanation']
+        ].reset_index(drop=True)
+        # Drop categories like 'none' that only occur on non-offensive rows, so charts skip them
+        self._offensive['offense_type'] = self._offensive['offense_type'].cat.remove_unused_categories()
+        self._original_data = None
+        if original_data_path:
+            self.set_compare_file(original_data_path)
         self.set_style()
+
+    @property
+    def original_data(self) -> pd.DataFrame:
+        # The comparison file is only read the first time a comparison needs it
+        if self._original_data is None and self.original_data_path:
+            self._original_data = _load(self.original_data_path)
+        return self._original_data
+
+    def set_compare_file(self, original_data_path: str):
+        # Only records the comparison file, so the primary data is never re-read
+        if original_data_path != self.original_data_path:
+            self.original_data_path = original_data_path
+            self._original_data = None
         
     def set_style(self):
         sns.set_theme()
         sns.set_palette("husl")
         plt.rcParams['figure.figsize'] = [12, 8]
         plt.rcParams['font.size'] = 12
+        plt.rcParams['path.simplify'] = True
+        plt.rcParams['path.simplify_threshold'] = 1.0
+        plt.rcParams['agg.path.chunksize'] = 10000
         
-    def compare_results(self, n_samples: int = None):
+    def compare_results(self, n_samples: int = None, *, plot: bool = True):
         if self.original_data is None:
             raise ValueError("Second file path not provided for comparison")
 
@@ -31,63 +232,75 @@ class HateSpeechVisualizer:
         file1_label = os.path.basename(self.data_path).replace('.csv', '')
         file2_label = os.path.basename(self.original_data_path).replace('.csv', '')
 
-        merged = pd.merge(
-            self.data[['comment_id', 'is_offensive', 'offense_type', 'severity']],
-            self.original_data[['comment_id', 'is_offensive', 'offense_type', 'severity']],
-            on='comment_id',
-            suffixes=('_1', '_2')
-        ).head(n_samples)
+        cols = ['comment_id', 'is_offensive', 'offense_type', 'severity']
+        left = self.data[cols].head(n_samples)
+        right = self.original_data[cols].head(n_samples)
+        if left['comment_id'].is_unique and np.array_equal(left['comment_id'].to_numpy(), right['comment_id'].to_numpy()):
+            # Both files list the same comments in the same order, so the join is a column concat
+            merged = pd.concat([
+                left.add_suffix('_1').rename(columns={'comment_id_1': 'comment_id'}),
+                right.drop(columns='comment_id').add_suffix('_2')
+            ], axis=1)
+        else:
+            merged = self.data[cols].join(
+                self.original_data[cols[1:]],
+                how='inner',
+                lsuffix='_1',
+                rsuffix='_2'
+            ).head(n_samples)
+
+        # Metrics: one bincount over (file1, file2) pairs encoded as 2*a + b
+        a = merged['is_offensive_1'].to_numpy(dtype=np.uint8)
+        b = merged['is_offensive_2'].to_numpy(dtype=np.uint8)
+        tn, fn, fp, tp = np.bincount(2 * a + b, minlength=4)
+        offensive_1 = a.astype(bool)
+        offensive_2 = b.astype(bool)
 
         # Confusion matrix
-        confusion_matrix = pd.crosstab(
-            merged['is_offensive_1'],
-            merged['is_offensive_2'],
-            rownames=[file1_label],
-            colnames=[file2_label]
+        confusion_matrix = pd.DataFrame(
+            [[tn, fn], [fp, tp]],
+            index=pd.Index([False, True], name=file1_label),
+            columns=pd.Index([False, True], name=file2_label)
         )
 
-        # Metrics
-        tp = confusion_matrix.loc[True, True] if (True in confusion_matrix.index and True in confusion_matrix.columns) else 0
-        fp = confusion_matrix.loc[True, False] if (True in confusion_matrix.index and False in confusion_matrix.columns) else 0
-        fn = confusion_matrix.loc[False, True] if (False in confusion_matrix.index and True in confusion_matrix.columns) else 0
-        tn = confusion_matrix.loc[False, False] if (False in confusion_matrix.index and False in confusion_matrix.columns) else 0
-
-        fig, axes = plt.subplots(2, 2, figsize=(16, 12))
-
-        sns.heatmap(confusion_matrix, annot=True, fmt='d', cmap='YlOrRd', ax=axes[0, 0])
-        axes[0, 0].set_title(f'Confusion Matrix\n({file1_label} vs {file2_label})')
-
-        # Plot 2: Distribution Comparison
-        comparison_counts = pd.DataFrame({
-            file1_label: merged['is_offensive_1'].value_counts(),
-            file2_label: merged['is_offensive_2'].value_counts()
-        })
-        comparison_counts.plot(kind='bar', ax=axes[0, 1])
-        axes[0, 1].set_title('Offensive Content Distribution')
-        axes[0, 1].set_xticklabels(['Non-Offensive', 'Offensive'], rotation=0)
-        axes[0, 1].set_ylabel('Count')
-
-        # Plot 3: Offense Type Comparison
-        offense_type_counts = pd.DataFrame({
-            file1_label: merged[merged['is_offensive_1']]['offense_type_1'].value_counts(),
-            file2_label: merged[merged['is_offensive_2']]['offense_type_2'].value_counts()
-        })
-        offense_type_counts.plot(kind='bar', ax=axes[1, 0])
-        axes[1, 0].set_title('Offense Type Distribution')
-        axes[1, 0].set_ylabel('Count')
-        axes[1, 0].tick_params(axis='x', rotation=45)
-
-        severity_df = pd.DataFrame({
-            file1_label: merged[merged['is_offensive_1']]['severity_1'],
-            file2_label: merged[merged['is_offensive_2']]['severity_2']
-        })
-        sns.boxplot(data=severity_df, ax=axes[1, 1])
-        axes[1, 1].set_title('Severity Score Comparison')
-        axes[1, 1].set_ylabel('Severity')
-
-        plt.tight_layout()
-        plt.savefig('file_comparison.png')
-        plt.close()
+        if plot:
+            fig, axes = plt.subplots(2, 2, figsize=(16, 12))
+
+            _annotated_heatmap(axes[0, 0], confusion_matrix, 'd')
+            axes[0, 0].set_title(f'Confusion Matrix\n({file1_label} vs {file2_label})')
+
+            # Plot 2: Distribution Comparison
+            # Per-file totals are margins of the confusion matrix, so no extra pass is needed
+            comparison_counts = pd.DataFrame(
+                {file1_label: [tn + fn, fp + tp], file2_label: [tn + fp, fn + tp]},
+                index=[False, True]
+            )
+            comparison_counts.plot(kind='bar', ax=axes[0, 1])
+            axes[0, 1].set_title('Offensive Content Distribution')
+            axes[0, 1].set_xticklabels(['Non-Offensive', 'Offensive'], rotation=0)
+            axes[0, 1].set_ylabel('Count')
+
+            # Plot 3: Offense Type Comparison
+            offense_type_counts = _category_table(
+                {file1_label: merged['offense_type_1'], file2_label: merged['offense_type_2']},
+                [offensive_1, offensive_2]
+            )
+            offense_type_counts.plot(kind='bar', ax=axes[1, 0])
+            axes[1, 0].set_title('Offense Type Distribution')
+            axes[1, 0].set_ylabel('Count')
+            axes[1, 0].tick_params(axis='x', rotation=45)
+
+            # Plain arrays: the two samples differ in length, so a DataFrame would only pad them with NaN
+            severities = [merged['severity_1'].to_numpy()[offensive_1], merged['severity_2'].to_numpy()[offensive_2]]
+            axes[1, 1].boxplot([sev[~np.isnan(sev)] for sev in severities], patch_artist=True, widths=0.8)
+            axes[1, 1].set_xticks([1, 2], labels=[file1_label, file2_label])
+            axes[1, 1].grid(False, axis='x')
+            axes[1, 1].set_title('Severity Score Comparison')
+            axes[1, 1].set_ylabel('Severity')
+
+            plt.tight_layout()
+            plt.savefig('file_comparison.png', **SAVEFIG_KWARGS)
+            plt.close()
 
         # Print metrics
         print(f"\n=== Comparison Results ({file1_label} vs {file2_label}) ===")
@@ -114,161 +327,161 @@ class HateSpeechVisualizer:
         print(f"F1 Score: {f1:.2%}")
         print("✓ Generated file comparison analysis")
 
-    def plot_offensive_distribution(self):
-        plt.figure(figsize=(10, 8))
+    def plot_offensive_distribution(self, ax=None):
+        own = ax is None
+        ax = _prepare_axes(ax, (10, 8))
         offensive_counts = self.data['is_offensive'].value_counts()
-        plt.pie(offensive_counts, 
-                labels=['Non-Offensive', 'Offensive'],
-                autopct='%1.1f%%',
-                startangle=90,
-                explode=(0.1, 0))
-        plt.title('Distribution of Offensive vs Non-Offensive Comments')
-        plt.axis('equal')
-        plt.savefig('offensive_distribution.png')
-        plt.close()
+        ax.pie(offensive_counts, 
+               labels=['Non-Offensive', 'Offensive'],
+               autopct='%1.1f%%',
+               startangle=90,
+               explode=(0.1, 0))
+        ax.set_title('Distribution of Offensive vs Non-Offensive Comments')
+        ax.axis('equal')
+        _save_axes(ax, 'offensive_distribution.png', own, tight=False)
         
-    def plot_offense_types(self, offense_type: str = None):
+    def plot_offense_types(self, offense_type: str = None, ax=None, *, plot: bool = True):
+        own = ax is None
         if offense_type:
             filtered_comments = self.data[self.data['offense_type'] == offense_type]
             if len(filtered_comments) == 0:
                 print(f"No comments found with offense type: {offense_type}")
                 return
 
-            plt.figure(figsize=(12, 6))
-            sns.histplot(data=filtered_comments, x='severity', bins=20)
-            plt.title(f'Severity Distribution for {offense_type}')
-            plt.xlabel('Severity Score')
-            plt.ylabel('Count')
-            plt.tight_layout()
-            plt.savefig(f'severity_distribution_{offense_type.replace(" ", "_")}.png')
-            plt.close()
+            if plot:
+                ax = _prepare_axes(ax, (12, 6))
+                _hist_bars(ax, filtered_comments['severity'].dropna().to_numpy(dtype=np.float64))
+                ax.set_title(f'Severity Distribution for {offense_type}')
+                ax.set_xlabel('Severity Score')
+                ax.set_ylabel('Count')
+                _save_axes(ax, f'severity_distribution_{offense_type.replace(" ", "_")}.png', own)
 
             print(f"\nComments with offense type '{offense_type}':")
             print(f"Total count: {len(filtered_comments)}")
             print("-" * 80)
-            for idx, row in filtered_comments.iterrows():
-                print(f"\nComment ID: {row['comment_id']}")
-                print(f"Username: {row['username']}")
-                print(f"Comment: {row['original_comment']}")
-                print(f"Severity: {row['severity']:.2f}")
-                print(f"Explanation: {row['explanation']}")
-                print("-" * 80)
-        else:
-            plt.figure(figsize=(12, 6))
+            write_comments(filtered_comments, show_type=False)
+        elif plot:
+            ax = _prepare_axes(ax, (12, 6))
             offense_counts = self.data['offense_type'].value_counts()
-            sns.barplot(x=offense_counts.index, y=offense_counts.values)
-            plt.title('Distribution of Offense Types')
-            plt.xlabel('Offense Type')
-            plt.ylabel('Count')
-            plt.xticks(rotation=45)
-            plt.tight_layout()
-            plt.savefig('offense_types.png')
-            plt.close()
+            ax.bar(range(len(offense_counts)), offense_counts.to_numpy())
+            ax.set_xticks(range(len(offense_counts)), labels=[str(t) for t in offense_counts.index])
+            ax.set_xlim(-0.5, len(offense_counts) - 0.5)
+            ax.grid(False, axis='x')
+            ax.set_title('Distribution of Offense Types')
+            ax.set_xlabel('Offense Type')
+            ax.set_ylabel('Count')
+            ax.tick_params(axis='x', rotation=45)
+            _save_axes(ax, 'offense_types.png', own)
         
-    def plot_severity_distribution(self):
-        plt.figure(figsize=(12, 6))
-        sns.histplot(data=self.data[self.data['is_offensive']], 
-                    x='severity', 
-                    bins=20,
-                    kde=True)
-        plt.title('Distribution of Severity Scores for Offensive Comments')
-        plt.xlabel('Severity Score')
-        plt.ylabel('Count')
-        plt.tight_layout()
-        plt.savefig('severity_distribution.png')
-        plt.close()
+    def plot_severity_distribution(self, ax=None):
+        own = ax is None
+        ax = _prepare_axes(ax, (12, 6))
+        sev = self._offensive['severity'].dropna().to_numpy(dtype=np.float64)
+        counts, edges = _hist_bars(ax, sev)
+        if len(sev) > 1 and sev.min() < sev.max():
+            # Scale the density to bar heights so the curve overlays the counts
+            xs = np.linspace(sev.min(), sev.max(), 200)
+            ax.plot(xs, _gaussian_kde(sev, xs) * len(sev) * (edges[1] - edges[0]))
+        ax.set_title('Distribution of Severity Scores for Offensive Comments')
+        ax.set_xlabel('Severity Score')
+        ax.set_ylabel('Count')
+        _save_axes(ax, 'severity_distribution.png', own)
         
-    def plot_offense_type_severity(self):
-        plt.figure(figsize=(12, 6))
-        sns.boxplot(data=self.data[self.data['is_offensive']],
-                   x='offense_type',
-                   y='severity')
-        plt.title('Severity Distribution by Offense Type')
-        plt.xlabel('Offense Type')
-        plt.ylabel('Severity Score')
-        plt.xticks(rotation=45)
-        plt.tight_layout()
-        plt.savefig('offense_type_severity.png')
-        plt.close()
+    def plot_offense_type_severity(self, ax=None):
+        own = ax is None
+        ax = _prepare_axes(ax, (12, 6))
+        groups = self._offensive.dropna(subset=['severity']).groupby('offense_type', observed=True)['severity']
+        labels = [str(name) for name, _ in groups]
+        ax.boxplot([group.to_numpy() for _, group in groups], patch_artist=True, widths=0.8)
+        ax.set_xticks(range(1, len(labels) + 1), labels=labels)
+        ax.grid(False, axis='x')
+        ax.set_title('Severity Distribution by Offense Type')
+        ax.set_xlabel('Offense Type')
+        ax.set_ylabel('Severity Score')
+        ax.tick_params(axis='x', rotation=45)
+        _save_axes(ax, 'offense_type_severity.png', own)
         
-    def plot_top_offensive_comments(self, n: int = 10, offense_type: str = None):
-        if offense_type:
+    def plot_top_offensive_comments(self, n: int = 10, offense_type: str = None, precomputed: pd.DataFrame = None, ax=None, *, plot: bool = True):
+        own = ax is None
+        if precomputed is not None:
+            # Rows already ranked and printed by CommentAnalyzer.display_top_severe_comments
+            top_comments = precomputed
+        elif offense_type:
             filtered_data = self.data[self.data['offense_type'] == offense_type]
             if len(filtered_data) == 0:
                 print(f"No comments found with offense type: {offense_type}")
                 return
-            top_comments = filtered_data.nlargest(n, 'severity')
+            top_comments = _top_severity(filtered_data, n)
             print(f"\nTop {n} Most Severe Comments (Offense Type: {offense_type}):")
         else:
-            top_comments = self.data.nlargest(n, 'severity')
+            top_comments = _top_severity(self.data, n)
             print(f"\nTop {n} Most Severe Comments:")
 
         # Create the plot
-        plt.figure(figsize=(12, 8))
-        sns.barplot(data=top_comments,
-                   x='severity',
-                   y='original_comment',
-                   orient='h')
-        plt.title(f'Top {n} Most Severe Comments' + (f' ({offense_type})' if offense_type else ''))
-        plt.xlabel('Severity Score')
-        plt.ylabel('Comment')
-        plt.tight_layout()
-        plt.savefig('top_offensive_comments.png')
-        plt.close()
+        if plot:
+            ax = _prepare_axes(ax, (12, 8))
+            # One bar per distinct comment text, as repeated texts share a row
+            bars = top_comments.groupby('original_comment', sort=False)['severity'].mean()
+            ax.barh(range(len(bars)), bars.to_numpy())
+            ax.set_yticks(range(len(bars)), labels=bars.index.tolist())
+            ax.set_ylim(len(bars) - 0.5, -0.5)
+            ax.grid(False, axis='y')
+            ax.set_title(f'Top {n} Most Severe Comments' + (f' ({offense_type})' if offense_type else ''))
+            ax.set_xlabel('Severity Score')
+            ax.set_ylabel('Comment')
+            _save_axes(ax, 'top_offensive_comments.png', own)
+
+        if precomputed is not None:
+            return
 
         print("-" * 80)
-        for idx, row in top_comments.iterrows():
-            print(f"\nComment ID: {row['comment_id']}")
-            print(f"Username: {row['username']}")
-            print(f"Comment: {row['original_comment']}")
-            print(f"Offense Type: {row['offense_type']}")
-            print(f"Severity: {row['severity']:.2f}")
-            print(f"Explanation: {row['explanation']}")
-            print("-" * 80)
+        write_comments(top_comments)
 
-    def plot_offense_type_heatmap(self):
-        plt.figure(figsize=(10, 8))
-        offense_severity = self.data[self.data['is_offensive']].pivot_table(
-            values='severity',
-            index='offense_type',
-            aggfunc=['mean', 'count']
-        )
-        sns.heatmap(offense_severity, 
-                   annot=True, 
-                   fmt='.2f',
-                   cmap='YlOrRd')
-        plt.title('Offense Type vs Severity Heatmap')
-        plt.tight_layout()
-        plt.savefig('offense_type_heatmap.png')
-        plt.close()
+    def plot_offense_type_heatmap(self, ax=None):
+        own = ax is None
+        ax = _prepare_axes(ax, (10, 8))
+        offense_severity = self._offensive.groupby('offense_type', observed=True)['severity'].agg(['mean', 'count'])
+        _annotated_heatmap(ax, offense_severity, '.2f')
+        ax.set_title('Offense Type vs Severity Heatmap')
+        _save_axes(ax, 'offense_type_heatmap.png', own)
         
     def generate_all_visualizations(self):
         print("Generating visualizations...")
+
+        fast = bool(os.environ.get('HSV_FAST'))
+        if fast:
+            # Scripted runs that only read the console output skip rendering the charts
+            self.plot_top_offensive_comments(plot=False)
+            print("Skipped chart rendering (HSV_FAST is set)")
+        else:
+            # Each chart writes its own PNG, so render them in parallel worker processes
+            with ProcessPoolExecutor(max_workers=min(len(PLOTS), os.cpu_count() or 1)) as executor:
+                futures = [executor.submit(_plot_worker, name, self.data_path) for name, _ in PLOTS]
+                for future, (_, message) in zip(futures, PLOTS):
+                    sys.stdout.write(future.result())
+                    print(message)
         
-        # Create standard visualizations
-        self.plot_offensive_distribution()
-        print("✓ Generated offensive distribution pie chart")
-        
-        self.plot_offense_types()
-        print("✓ Generated offense types bar chart")
-        
-        self.plot_severity_distribution()
-        print("✓ Generated severity distribution histogram")
-        
-        self.plot_offense_type_severity()
-        print("✓ Generated offense type severity box plot")
-        
-        self.plot_top_offensive_comments()
-        print("✓ Generated top offensive comments chart")
-        
-        self.plot_offense_type_heatmap()
-        print("✓ Generated offense type heatmap")
-        
-        if self.original_data is not None:
-            self.compare_results()
+        if self.original_data_path:
+            self.compare_results(plot=not fast)
             print("✓ Generated file comparison analysis")
         
-        print("\nAll visualizations have been saved as PNG files in the current directory.")
+        if not fast:
+            print("\nAll visualizations have been saved as PNG files in the current directory.")
+
+_worker_figure = None
+
+def _plot_worker(name: str, data_path: str) -> str:
+    # Reloading is cheap thanks to the Parquet cache; output is returned so the parent prints it in order
+    global _worker_figure
+    visualizer = HateSpeechVisualizer(data_path)
+    if _worker_figure is None:
+        # One figure per worker process, outside pyplot's figure manager, reused for every chart it draws
+        _worker_figure = Figure()
+    ax = _worker_figure.axes[0] if _worker_figure.axes else _worker_figure.add_subplot()
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        getattr(visualizer, name)(ax=ax)
+    return out.getvalue()
 
 if __name__ == "__main__":
     visualizer = HateSpeechVisualizer(